@@ -1,11 +1,24 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
 import numpy as np
+import openpyxl
 from datetime import datetime, timedelta
 import io
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 import warnings
 warnings.filterwarnings('ignore')
 
+# Let column selections share memory with their parent frame until written to
+pd.set_option('mode.copy_on_write', True)
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
 # Configure the page
 st.set_page_config(
     page_title="FIFO Work Order Processor",
@@ -55,84 +68,324 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def parse_excel_file(uploaded_file):
-    """Parse the uploaded Excel file and extract work order data"""
+# Row count above which the post-parse steps run in worker threads
+PARALLEL_MIN_ROWS = 10_000
+
+# Columns shown in the picking list, in display order
+PICKING_COLUMNS = (
+    'Component', 'Description', 'Batch Nr', 'DLUO',
+    'Available Quantity', 'Quantity required', 'Warehouse Stock',
+    'depot location', 'Build', 'Zone', 'Location Description'
+)
+
+# Columns read by the summary, FIFO and picking list steps
+REQUIRED_COLUMNS = frozenset({
+    'Production Ticket Nr', 'Wording', 'Product Code', 'Batch Nr', 'Manager',
+    'Quantity launched Theoretical', 'Current date marked the beginning', *PICKING_COLUMNS
+})
+
+# Text columns that repeat across rows and are stored as categories when
+# fewer than CATEGORY_MAX_UNIQUE_RATIO of their values are distinct
+CATEGORY_COLUMNS = (
+    'Component', 'Description', 'Batch Nr', 'Wording', 'Manager',
+    'depot location', 'Build', 'Zone', 'Location Description'
+)
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+# Quantity columns collected into typed arrays by the filtered reader
+QUANTITY_COLUMNS = ('Quantity required', 'Available Quantity')
+
+# Columns read as text so pandas skips type inference on them
+STRING_COLUMNS = {'Component': str, 'Batch Nr': str, 'Product Code': str}
+
+def _header_names(header):
+    """Name blank and duplicated headers the same way pd.read_excel does"""
+    columns = []
+    seen = {}
+    for i, col in enumerate(header):
+        name = f"Unnamed: {i}" if col is None or col == '' else col
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+def _cell_text(value):
+    """Render a cell as text, dropping the .0 Excel adds to whole numbers"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+def _read_xlsx_readonly(fp, sheet='Feuil1', header_row=3):
+    """Stream an .xlsx sheet through openpyxl's read-only mode into a DataFrame"""
+    wb = openpyxl.load_workbook(fp, read_only=True, data_only=True)
     try:
-        # Read the Excel file
-        df = pd.read_excel(uploaded_file, sheet_name='Feuil1', header=3)
+        rows = wb[sheet].iter_rows(values_only=True)
         
-        # Clean column names
-        df.columns = [str(col).strip().replace('\n', ' ') for col in df.columns]
-        
-        # Remove empty rows
-        df = df.dropna(how='all')
+        # Skip the title block and take the next row as header
+        header = next(islice(rows, header_row, None), ())
+        records = list(rows)
+    finally:
+        # Close explicitly to free the ZIP handle
+        wb.close()
+    
+    df = pd.DataFrame.from_records(records, columns=_header_names(header))
+    for col in STRING_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+def _read_xlsx_filtered(fp, components, sheet='Feuil1', header_row=3):
+    """Stream an .xlsx sheet through calamine, keeping only the given components"""
+    rows = CalamineWorkbook.from_filelike(fp).get_sheet_by_name(sheet).iter_rows()
+    
+    # Skip the title block and take the next row as header
+    columns = _header_names(next(islice(rows, header_row, None), []))
+    names = [str(col).strip().replace('\n', ' ') for col in columns]
+    component_pos = names.index('Component')
+    
+    # Quantities go into typed arrays, everything else into plain lists
+    data = [array('d') if col in QUANTITY_COLUMNS else [] for col in names]
+    wanted = set(components)
+    for row in rows:
+        if _cell_text(row[component_pos]) not in wanted:
+            continue
+        for values, col, value in zip(data, names, row):
+            if value == '':
+                value = np.nan if isinstance(values, array) else None
+            elif col in STRING_COLUMNS:
+                value = _cell_text(value)
+            values.append(value)
+    
+    # Give every column the dtype the unfiltered read would: typed arrays
+    # stay float64 and columns of date cells become datetime64
+    frame = {}
+    for col, values in zip(columns, data):
+        if isinstance(values, array):
+            frame[col] = np.asarray(values, dtype='float64')
+        elif pd.api.types.infer_dtype(values, skipna=True) in ('date', 'datetime'):
+            frame[col] = pd.to_datetime(pd.Series(values, dtype=object))
+        else:
+            frame[col] = values
+    return pd.DataFrame(frame)
+
+def _read_work_order(fp, name, components=()):
+    """Read the work order sheet, using the calamine engine for .xlsx files"""
+    if name.lower().endswith('.xlsx'):
+        if components and CalamineWorkbook is not None:
+            try:
+                return _read_xlsx_filtered(fp, components)
+            except Exception:
+                # Fall back to a full read filtered afterwards
+                fp.seek(0)
+        try:
+            df = pd.read_excel(fp, engine='calamine', sheet_name='Feuil1', header=3, dtype=STRING_COLUMNS)
+        except Exception:
+            # Fall back to openpyxl (e.g. python-calamine not installed)
+            fp.seek(0)
+            df = _read_xlsx_readonly(fp)
+    else:
+        df = pd.read_excel(fp, sheet_name='Feuil1', header=3, dtype=STRING_COLUMNS)
+    
+    if components and 'Component' in df.columns:
+        df = df[df['Component'].isin(components)]
+    return df
+
+def _downcast(df):
+    """Shrink numeric columns to the smallest dtype that holds their values"""
+    for col in df.columns:
+        if col == 'DLUO' or not pd.api.types.is_numeric_dtype(df[col]) or pd.api.types.is_bool_dtype(df[col]):
+            continue
         
-        return df
+        # Whole-number columns become small ints, the rest float32
+        values = pd.to_numeric(df[col], downcast='integer')
+        if pd.api.types.is_float_dtype(values):
+            values = pd.to_numeric(values, downcast='float')
+        df[col] = values
+    
+    return df
+
+# Parsed work orders kept in the process-wide cache. Sessions already hold
+# their own frame, so this only needs to cover re-uploads of recent files
+PARSE_CACHE_ENTRIES = 4
+
+@st.cache_data(show_spinner=False, max_entries=PARSE_CACHE_ENTRIES)
+def _parse_bytes(data: bytes, name: str, components: tuple = ()) -> pd.DataFrame:
+    """Parse the raw bytes of a work order file (cached on the file content)"""
+    # Read the Excel file
+    df = _read_work_order(io.BytesIO(data), name, components)
+    
+    # Clean column names
+    df.columns = df.columns.astype(str).str.strip().str.replace('\n', ' ', regex=False)
+    
+    # Remove empty rows
+    df = df.dropna(how='all')
+    
+    # Store heavily repeated text columns as categories
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and df[col].nunique() < CATEGORY_MAX_UNIQUE_RATIO * len(df):
+            df[col] = df[col].astype('category')
+    
+    # Keep the remaining text columns in Arrow-backed storage, which is what
+    # Streamlit serializes to the browser anyway
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) == 'string':
+            df[col] = df[col].astype('string[pyarrow]')
+    
+    return _downcast(df)
+
+def parse_excel_file(uploaded_file, components=()):
+    """Parse the uploaded Excel file and extract work order data"""
+    try:
+        return _parse_bytes(uploaded_file.getvalue(), uploaded_file.name, components)
     except Exception as e:
         st.error(f"Error parsing Excel file: {str(e)}")
         return None
 
+def _parse_dluo(dluo):
+    """Convert DDMMYYYY expiration codes to datetimes"""
+    if pd.api.types.is_datetime64_any_dtype(dluo):
+        return dluo
+    
+    if pd.api.types.is_numeric_dtype(dluo) and not pd.api.types.is_bool_dtype(dluo):
+        # Excel stores the codes as numbers: split the digits arithmetically
+        v = dluo.to_numpy(dtype='float64')
+        parts = pd.DataFrame({'year': v % 10000, 'month': v // 10000 % 100, 'day': v // 1000000}, index=dluo.index)
+        return pd.to_datetime(parts, errors='coerce')
+    
+    # Text codes repeat across batches, so cache=True parses each distinct value once
+    codes = dluo.astype('string').str.strip().str.zfill(8)
+    return pd.to_datetime(codes, format='%d%m%Y', errors='coerce', cache=True)
+
 def apply_fifo_logic(df):
     """Apply FIFO logic to the work order data"""
     try:
         # Convert DLUO to datetime for proper sorting
-        df['DLUO'] = pd.to_datetime(df['DLUO'], errors='coerce', format='%d%m%Y')
+        df = df.assign(DLUO=_parse_dluo(df['DLUO']), Component=df['Component'].astype('category'))
         
-        # Sort by Component and DLUO (FIFO - oldest first)
-        df_sorted = df.sort_values(['Component', 'DLUO'], ascending=[True, True])
+        # Sort by Component and DLUO (FIFO - oldest first) on the integer
+        # category codes and timestamps, keeping missing values last
+        codes = df['Component'].cat.codes.to_numpy()
+        codes = np.where(codes < 0, np.iinfo(codes.dtype).max, codes)
+        dluo = df['DLUO'].to_numpy().view('i8')
+        dluo = np.where(df['DLUO'].isna().to_numpy(), np.iinfo(np.int64).max, dluo)
+        df_sorted = df.take(np.lexsort((dluo, codes)))
         
         return df_sorted
     except Exception as e:
         st.error(f"Error applying FIFO logic: {str(e)}")
-        return df
+        return None
 
 def generate_work_order_summary(df):
     """Generate a summary of the work order"""
     if df.empty:
         return None
     
+    # Work order details repeat on every row, so read them from the first one
+    first_row = df.iloc[0]
+    
+    # Categories are built from the parsed values, so they are the distinct components
+    components = df['Component']
+    if isinstance(components.dtype, pd.CategoricalDtype):
+        total_components = components.cat.categories.size
+    else:
+        total_components = components.nunique()
+    
     summary = {
-        'Production_Ticket_Nr': df['Production Ticket Nr'].iloc[0],
-        'Wording': df['Wording'].iloc[0],
-        'Product_Code': df['Product Code'].iloc[0],
-        'Batch_Nr': df['Batch Nr'].iloc[0],
-        'Manager': df['Manager'].iloc[0],
-        'Quantity_Launched': df['Quantity launched Theoretical'].iloc[0],
-        'Start_Date': df['Current date marked the beginning'].iloc[0],
-        'Total_Components': df['Component'].nunique(),
+        'Production_Ticket_Nr': first_row['Production Ticket Nr'],
+        'Wording': first_row['Wording'],
+        'Product_Code': first_row['Product Code'],
+        'Batch_Nr': first_row['Batch Nr'],
+        'Manager': first_row['Manager'],
+        'Quantity_Launched': first_row['Quantity launched Theoretical'],
+        'Start_Date': first_row['Current date marked the beginning'],
+        'Total_Components': total_components,
         'Total_Rows': len(df)
     }
     
     return summary
 
+def _compute_fifo_views(df_sorted):
+    """Roll up the FIFO-sorted rows per component in a single grouping pass"""
+    gb = df_sorted.groupby('Component', sort=False, observed=True)
+    
+    component_summary = pd.DataFrame({
+        'Description': gb['Description'].first(),
+        'Quantity required': gb['Quantity required'].first(),
+        'Available Quantity': gb['Available Quantity'].sum(),
+        'Batch Nr': gb['Batch Nr'].count(),
+        'DLUO': gb['DLUO'].min()
+    }).reset_index()
+    
+    return component_summary
+
 def calculate_component_requirements(df):
     """Calculate component requirements and availability"""
-    component_summary = df.groupby(['Component', 'Description']).agg({
-        'Quantity required': 'first',
-        'Available Quantity': 'sum',
-        'Batch Nr': 'count',
-        'DLUO': 'min'
-    }).reset_index()
+    component_summary = _compute_fifo_views(df)
     
     component_summary['Sufficient_Stock'] = component_summary['Available Quantity'] >= component_summary['Quantity required']
-    component_summary['Shortage'] = component_summary['Quantity required'] - component_summary['Available Quantity']
-    component_summary['Shortage'] = component_summary['Shortage'].apply(lambda x: max(0, x))
+    component_summary['Shortage'] = np.fmax(
+        component_summary['Quantity required'].to_numpy() - component_summary['Available Quantity'].to_numpy(), 0
+    )
     
     return component_summary
 
 def generate_picking_list(df):
     """Generate FIFO-based picking list"""
-    picking_list = df[[
-        'Component', 'Description', 'Batch Nr', 'DLUO', 
-        'Available Quantity', 'Quantity required', 'Warehouse Stock',
-        'depot location', 'Build', 'Zone', 'Location Description'
-    ]].copy()
+    # Column selection is lazy under copy-on-write, so no data is copied here
+    picking_list = df.loc[:, list(PICKING_COLUMNS)]
     
-    # Mark priority items (oldest DLUO first)
-    picking_list['DLUO_Rank'] = picking_list.groupby('Component')['DLUO'].rank(method='first')
-    picking_list['Priority'] = picking_list['DLUO_Rank'] == 1
+    # Mark priority items (oldest DLUO first): rows are FIFO-sorted, so this
+    # is the first row of each component
+    priority = (~df['Component'].duplicated(keep='first')).to_numpy()
     
-    return picking_list
+    return picking_list, priority
+
+def _run_steps(views, steps, parallel):
+    """Run the steps not yet stored in views, in worker threads when parallel.
+    Failed steps return None and are left out so they run again next time"""
+    missing = {name: step for name, step in steps.items() if name not in views}
+    if not parallel or len(missing) < 2:
+        results = {name: func(arg) for name, (func, arg) in missing.items()}
+    else:
+        # Worker threads need the script context to show errors
+        ctx = get_script_run_ctx()
+        with ThreadPoolExecutor(max_workers=len(missing), initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+            futures = {name: executor.submit(func, arg) for name, (func, arg) in missing.items()}
+        results = {name: future.result() for name, future in futures.items()}
+    
+    views.update((name, result) for name, result in results.items() if result is not None)
+
+def process_work_order(df, views, with_requirements, with_picking_list):
+    """Run the steps that follow parsing, reusing results stored in views and
+    overlapping the rest for large work orders"""
+    parallel = len(df) > PARALLEL_MIN_ROWS
+    
+    # The summary reads the unsorted rows, so it runs alongside the FIFO sort
+    _run_steps(views, {
+        'summary': (generate_work_order_summary, df),
+        'df_fifo': (apply_fifo_logic, df)
+    }, parallel)
+    summary = views.get('summary')
+    df_fifo = views.get('df_fifo')
+    if df_fifo is None:
+        return summary, None, None, None
+    
+    steps = {}
+    if with_requirements:
+        steps['component_summary'] = (calculate_component_requirements, df_fifo)
+    if with_picking_list:
+        steps['picking'] = (generate_picking_list, df_fifo)
+    _run_steps(views, steps, parallel)
+    
+    return (
+        summary,
+        df_fifo,
+        views.get('component_summary') if with_requirements else None,
+        views.get('picking') if with_picking_list else None
+    )
 
 def main():
     st.markdown('<div class="main-header">🏭 FIFO Work Order Processor</div>', unsafe_allow_html=True)
@@ -141,11 +394,17 @@ def main():
     with st.sidebar:
         st.header("📁 File Upload")
         uploaded_file = st.file_uploader("Upload Excel Work Order", type=['xlsx', 'xls'])
+        component_filter = st.text_input(
+            "Component Filter",
+            help="Comma-separated component codes to load. Leave empty to load every component."
+        )
+        components = tuple(sorted({c.strip() for c in component_filter.split(',') if c.strip()}))
         
         st.header("⚙️ Settings")
         show_raw_data = st.checkbox("Show Raw Data", value=False)
         show_picking_list = st.checkbox("Show Picking List", value=True)
         show_shortages = st.checkbox("Show Stock Shortages", value=True)
+        show_stock_metrics = st.checkbox("Show Stock Metrics", value=True)
         
         st.header("ℹ️ About")
         st.info("""
@@ -158,80 +417,108 @@ def main():
     
     # Main content area
     if uploaded_file is not None:
-        # Parse the uploaded file
-        df = parse_excel_file(uploaded_file)
+        # Parse the uploaded file once and keep it, with the views derived from
+        # it, in the session until the file or filter changes
+        parsed_key = (uploaded_file.file_id, components)
+        if st.session_state.get('parsed_key') == parsed_key:
+            df = st.session_state['df']
+        else:
+            df = parse_excel_file(uploaded_file, components)
+            
+            # Only keep successful parses, so a failure is retried and its error shown again
+            if df is not None:
+                st.session_state['df'] = df
+                st.session_state['views'] = {}
+                st.session_state['parsed_key'] = parsed_key
+            else:
+                for key in ('parsed_key', 'df', 'views'):
+                    st.session_state.pop(key, None)
         
         if df is not None and not df.empty:
+            # Check every column the processing reads before doing any work
+            missing = REQUIRED_COLUMNS - set(df.columns)
+            if missing:
+                st.error(f"Missing required columns: {', '.join(sorted(missing))}")
+                st.stop()
+            
+            # Run the processing steps for the sections being shown
+            summary, df_fifo, component_summary, picking = process_work_order(
+                df, st.session_state['views'], show_stock_metrics or show_shortages, show_picking_list
+            )
+            
             # Display basic file info
             st.markdown('<div class="section-header">📊 Work Order Overview</div>', unsafe_allow_html=True)
             
-            # Generate and display summary
-            summary = generate_work_order_summary(df)
+            # Display summary
             if summary:
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("Production Ticket", summary['Production_Ticket_Nr'])
-                    st.metric("Product Code", summary['Product_Code'])
-                with col2:
-                    st.metric("Wording", summary['Wording'])
-                    st.metric("Batch Number", summary['Batch_Nr'])
-                with col3:
-                    st.metric("Manager", summary['Manager'])
-                    st.metric("Quantity", f"{summary['Quantity_Launched']:,}")
-                with col4:
-                    st.metric("Components", summary['Total_Components'])
-                    st.metric("Start Date", summary['Start_Date'])
+                # Render the overview as one table rather than one element per metric
+                metrics_df = pd.DataFrame([
+                    ('Production Ticket', summary['Production_Ticket_Nr']),
+                    ('Product Code', summary['Product_Code']),
+                    ('Wording', summary['Wording']),
+                    ('Batch Number', summary['Batch_Nr']),
+                    ('Manager', summary['Manager']),
+                    ('Quantity', f"{summary['Quantity_Launched']:,}"),
+                    ('Components', summary['Total_Components']),
+                    ('Start Date', summary['Start_Date'])
+                ], columns=['Metric', 'Value'])
+                st.table(metrics_df.astype(str).set_index('Metric'))
             
-            # Apply FIFO logic
+            # FIFO logic
             st.markdown('<div class="section-header">🔄 Applying FIFO Logic</div>', unsafe_allow_html=True)
-            df_fifo = apply_fifo_logic(df)
             
-            if not df_fifo.empty:
+            if df_fifo is not None and not df_fifo.empty:
                 st.success("✅ FIFO logic applied successfully! Components sorted by expiration date (DLUO).")
                 
-                # Display component requirements
-                st.markdown('<div class="section-header">📦 Component Requirements</div>', unsafe_allow_html=True)
-                component_summary = calculate_component_requirements(df_fifo)
-                
-                # Display stock status
-                total_components = len(component_summary)
-                sufficient_stock = component_summary['Sufficient_Stock'].sum()
-                shortages = total_components - sufficient_stock
-                
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Total Components", total_components)
-                with col2:
-                    st.metric("Sufficient Stock", sufficient_stock)
-                with col3:
-                    st.metric("Shortages", shortages, delta=f"-{shortages}")
-                
-                # Show shortages if any
-                if show_shortages and shortages > 0:
-                    shortage_df = component_summary[component_summary['Sufficient_Stock'] == False]
-                    if not shortage_df.empty:
-                        st.markdown('<div class="warning-box">⚠️ Stock Shortages Detected</div>', unsafe_allow_html=True)
-                        st.dataframe(shortage_df[['Component', 'Description', 'Quantity required', 'Available Quantity', 'Shortage']])
+                # Component requirements are only needed for the stock metrics and shortages
+                if component_summary is not None:
+                    st.markdown('<div class="section-header">📦 Component Requirements</div>', unsafe_allow_html=True)
+                    
+                    # Display stock status
+                    total_components = len(component_summary)
+                    sufficient_stock = component_summary['Sufficient_Stock'].sum()
+                    shortages = total_components - sufficient_stock
+                    
+                    if show_stock_metrics:
+                        col1, col2, col3 = st.columns(3)
+                        with col1:
+                            st.metric("Total Components", total_components)
+                        with col2:
+                            st.metric("Sufficient Stock", sufficient_stock)
+                        with col3:
+                            st.metric("Shortages", shortages, delta=f"-{shortages}")
+                    
+                    # Show shortages if any
+                    if show_shortages and shortages > 0:
+                        shortage_df = component_summary[component_summary['Sufficient_Stock'] == False]
+                        if not shortage_df.empty:
+                            st.markdown('<div class="warning-box">⚠️ Stock Shortages Detected</div>', unsafe_allow_html=True)
+                            st.dataframe(shortage_df[['Component', 'Description', 'Quantity required', 'Available Quantity', 'Shortage']])
                 
-                # Generate and display picking list
-                if show_picking_list:
+                # Display picking list
+                if picking is not None:
                     st.markdown('<div class="section-header">📋 FIFO Picking List</div>', unsafe_allow_html=True)
-                    picking_list = generate_picking_list(df_fifo)
+                    picking_list, priority = picking
+                    picking_list = picking_list.assign(Priority=priority)
                     
-                    # Add color coding for priority items
-                    def highlight_priority(row):
-                        if row['Priority']:
-                            return ['background-color: #fff3cd'] * len(row)
-                        return [''] * len(row)
+                    # Add color coding for priority items, styling the whole table at once
+                    def highlight_priority(data):
+                        css = np.where(data['Priority'].to_numpy()[:, None], 'background-color: #fff3cd', '')
+                        return pd.DataFrame(np.broadcast_to(css, data.shape), index=data.index, columns=data.columns)
                     
-                    styled_picking_list = picking_list.style.apply(highlight_priority, axis=1)
+                    styled_picking_list = picking_list.style.apply(highlight_priority, axis=None)
                     st.dataframe(styled_picking_list, use_container_width=True)
                     
                     # Download button for picking list
-                    csv = picking_list.to_csv(index=False)
+                    # Write the CSV straight to bytes, in chunks for large lists
+                    csv = io.BytesIO()
+                    picking_list.to_csv(
+                        csv, index=False, encoding='utf-8', lineterminator='\n',
+                        chunksize=50_000 if len(picking_list) > 10_000 else None
+                    )
                     st.download_button(
                         label="📥 Download Picking List (CSV)",
-                        data=csv,
+                        data=csv.getvalue(),
                         file_name=f"picking_list_{summary['Production_Ticket_Nr']}.csv",
                         mime="text/csv"
                     )
@@ -244,10 +531,17 @@ def main():
             else:
                 st.error("No data available after applying FIFO logic.")
         
+        elif components and df is not None:
+            st.warning(f"No rows match the component filter: {', '.join(components)}")
+        
         else:
             st.error("Could not parse the Excel file or file is empty.")
     
     else:
+        # Drop the previous upload's data once the file is removed
+        for key in ('parsed_key', 'df', 'views'):
+            st.session_state.pop(key, None)
+        
         # Demo mode with sample data structure
         st.markdown('<div class="section-header">📋 Expected Excel File Format</div>', unsafe_allow_html=True)
         